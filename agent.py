@@ -75,6 +75,9 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 from ddgs import DDGS
+from google import genai
+from google.genai import types
+from utils.model_registry import ModelRegistry
 import os, datetime
 from rich.console import Console
 
@@ -136,8 +139,47 @@ class AgentState(TypedDict):
 
 
 # --- 3. Initialize Model ---
-llm = ChatGoogleGenerativeAI(model=os.environ.get("MODEL_NAME"))
-llm_with_tools = llm.bind_tools(tools)
+MODEL_NAME = os.environ.get("MODEL_NAME")
+MODEL_TIMEOUT = float(os.environ.get("MODEL_TIMEOUT", 60))  # Slower => fallback
+MODEL_FALLBACKS = int(os.environ.get("MODEL_FALLBACKS", 2))
+MODEL_MIN_CONTEXT = int(os.environ.get("MODEL_MIN_CONTEXT", 32000))
+MODEL_AUTOSELECT = os.environ.get("MODEL_AUTOSELECT", "false").lower() == "true"
+MODEL_MAX_BENCHMARKS = int(os.environ.get("MODEL_MAX_BENCHMARKS", 5))
+
+# Rank tool-calling models by speed (cached, see utils/model_registry.py)
+# Only a few new models are benchmarked: enough for the fallbacks, or
+# MODEL_MAX_BENCHMARKS when auto-selecting (+1 so the primary can be skipped)
+limit = MODEL_MAX_BENCHMARKS if MODEL_AUTOSELECT else MODEL_FALLBACKS + 1
+try:
+    # Timeout (ms) so a stalled benchmark errors out instead of blocking startup
+    client = genai.Client(
+        api_key=os.environ.get("GOOGLE_API_KEY"),
+        http_options=types.HttpOptions(timeout=int(MODEL_TIMEOUT * 1000)),
+    )
+    ranked = ModelRegistry(client).ranked(min_context=MODEL_MIN_CONTEXT, limit=limit)
+except Exception as e:
+    console.print(f"--- [MODEL REGISTRY]->Unavailable: {e}", style="orange_red1")
+    ranked = []
+
+# Use the fastest model if auto-select is on, else the one from '.env'
+primary = ranked[0] if MODEL_AUTOSELECT and ranked else MODEL_NAME
+fallbacks = [m for m in ranked if m != primary][:MODEL_FALLBACKS]
+console.print(f"--- [MODEL]->Using: {primary}, fallbacks: {fallbacks}", style="blue")
+
+
+def init_model(name: str, has_fallback: bool):
+    # Timeout so a slow model errors out; with a fallback next in line, retry
+    # only once so an erroring/slow model quickly hands over to the next one
+    retries = {"max_retries": 1} if has_fallback else {}
+    llm = ChatGoogleGenerativeAI(model=name, timeout=MODEL_TIMEOUT, **retries)
+    return llm.bind_tools(tools)
+
+
+chain = [primary] + fallbacks
+models = [init_model(m, has_fallback=i < len(chain) - 1) for i, m in enumerate(chain)]
+llm_with_tools = models[0]
+if fallbacks:
+    llm_with_tools = llm_with_tools.with_fallbacks(models[1:])
 
 # --- 4. Define Nodes ---
 
@@ -1,19 +1,30 @@
-import os
+import os, sys
 from google import genai
 from utils.utils import checkAPIKey
+from utils.model_registry import ModelRegistry
 
 # Check for API Key
 checkAPIKey(streamlit=False)
 
+# Usage: python check_models.py [--refresh]
+refresh = "--refresh" in sys.argv
+
 try:
-    # Initialize Client
+    # Initialize Client & registry (catalog is cached locally with a TTL)
     client = genai.Client(api_key=os.environ.get("GOOGLE_API_KEY"))
+    registry = ModelRegistry(client)
     print(f"--- 📡 Listing All Available Models ---")
-    # Simple List (No attribute filtering to avoid errors)
-    pager = client.models.list()
-    for model in pager:
-        # Just print models, that are present
-        print(f"✅ Found: {model.name}")
+    for name in registry.list_models(refresh=refresh):
+        print(f"✅ Found: {name}")
+
+    print(f"\n--- ⏱️ Benchmarking Tool-Calling Models (fastest first) ---")
+    ranked = registry.ranked(tools=True)
+    for name in ranked:
+        result = registry.cache["benchmarks"][name]
+        print(f"🚀 {name}: {result['ttft']}s to first token, {result['tps']} tokens/s")
+    for name, result in registry.cache["benchmarks"].items():
+        if result["error"]:
+            print(f"❌ {name}: {result['error']}")
 
 except Exception as e:
     print(f"Error: {e}")
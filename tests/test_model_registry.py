@@ -0,0 +1,239 @@
+from types import SimpleNamespace
+import pytest
+from utils.model_registry import ModelRegistry
+
+
+# --- Stub client (shaped like google.genai.Client) ---
+def model(name, context=1_000_000, actions=("generateContent",)):
+    return SimpleNamespace(
+        name=f"models/{name}", input_token_limit=context, supported_actions=actions
+    )
+
+
+def chunk(text, tokens):
+    usage = SimpleNamespace(candidates_token_count=tokens)
+    return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+class StubModels:
+    def __init__(self, catalog, streams=None):
+        self.catalog = catalog
+        self.streams = streams or {}  # {name: [chunks] or Exception}
+        self.list_calls = 0
+        self.stream_calls = []
+
+    def list(self):
+        self.list_calls += 1
+        return list(self.catalog)
+
+    def generate_content_stream(self, model, contents):
+        self.stream_calls.append(model)
+        stream = self.streams.get(model, [chunk("1, 2", 5)])
+        if isinstance(stream, Exception):
+            raise stream
+        return iter(stream)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def timer(*values):
+    return iter(values).__next__
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def make_registry(tmp_path, clock):
+    def make(models, **kwargs):
+        client = SimpleNamespace(models=models)
+        path = str(tmp_path / "cache.json")
+        return ModelRegistry(client, cache_path=path, ttl=100, clock=clock, **kwargs)
+
+    return make
+
+
+# --- Catalog cache ---
+def test_catalog_cached_until_ttl(make_registry, clock):
+    models = StubModels([model("gemini-2.5-flash")])
+    registry = make_registry(models)
+
+    assert list(registry.list_models()) == ["gemini-2.5-flash"]
+    clock.now += 50
+    registry.list_models()
+    assert models.list_calls == 1
+
+    clock.now += 51
+    registry.list_models()
+    assert models.list_calls == 2
+
+
+def test_catalog_cache_persisted(make_registry):
+    make_registry(StubModels([model("gemini-2.5-flash")])).list_models()
+
+    models = StubModels([])
+    assert list(make_registry(models).list_models()) == ["gemini-2.5-flash"]
+    assert models.list_calls == 0
+
+
+def test_refresh_clears_benchmarks(make_registry, clock):
+    registry = make_registry(StubModels([model("gemini-2.5-flash")]))
+    registry.ranked()
+    assert "gemini-2.5-flash" in registry.cache["benchmarks"]
+
+    clock.now += 101
+    registry.list_models()
+    assert registry.cache["benchmarks"] == {}
+
+
+def test_env_overrides_read_at_init(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_CACHE_PATH", str(tmp_path / "env.json"))
+    monkeypatch.setenv("MODEL_CACHE_TTL", "42")
+    registry = ModelRegistry(SimpleNamespace(models=StubModels([])))
+    assert registry.cache_path == str(tmp_path / "env.json")
+    assert registry.ttl == 42
+
+
+# --- Capability filter ---
+def test_candidates_filter(make_registry):
+    registry = make_registry(
+        StubModels(
+            [
+                model("gemini-2.5-flash"),
+                model("gemini-small", context=8000),
+                model("gemini-embedding-001", actions=("embedContent",)),
+                model("gemini-2.5-flash-preview-tts"),
+                model("gemini-2.0-flash-exp-image-generation"),
+                model("gemma-3-27b-it"),
+                model("gemini-2.5-pro", actions=("countTokens",)),
+            ]
+        )
+    )
+
+    assert registry.candidates(min_context=32000) == ["gemini-2.5-flash"]
+    assert registry.candidates() == ["gemini-2.5-flash", "gemini-small"]
+    assert "gemma-3-27b-it" in registry.candidates(tools=False)
+
+
+# --- Benchmark ---
+def test_benchmark_math(make_registry):
+    stream = [chunk("1, 2, 3", 4), chunk(", 4, 5", 10)]
+    registry = make_registry(
+        StubModels([model("gemini-2.5-flash")], {"gemini-2.5-flash": stream})
+    )
+
+    # start, first chunk, end
+    result = registry.benchmark("gemini-2.5-flash", timer=timer(0.0, 0.5, 2.0))
+    assert result["ttft"] == 0.5
+    assert result["tps"] == 5.0  # 10 tokens over the whole 2s call
+    assert result["error"] is None
+
+
+def test_benchmark_error(make_registry):
+    registry = make_registry(
+        StubModels([model("gemini-2.5-pro")], {"gemini-2.5-pro": RuntimeError("429")})
+    )
+
+    result = registry.benchmark("gemini-2.5-pro")
+    assert result["error"] == "429"
+    assert result["ttft"] is None
+
+
+def test_benchmark_empty_response(make_registry):
+    registry = make_registry(
+        StubModels([model("gemini-2.5-pro")], {"gemini-2.5-pro": []})
+    )
+    assert registry.benchmark("gemini-2.5-pro")["error"] == "empty response"
+
+
+def test_failed_benchmark_retried_after_error_ttl(make_registry, clock):
+    models = StubModels([model("gemini-2.5-pro")], {"gemini-2.5-pro": RuntimeError("429")})
+    registry = make_registry(models, error_ttl=10)
+    assert registry.ranked() == []
+
+    # Recovered, but the error is still fresh (also for a new instance)
+    models.streams = {}
+    assert make_registry(models, error_ttl=10).ranked() == []
+    assert models.stream_calls == ["gemini-2.5-pro"]
+
+    clock.now += 11
+    assert make_registry(models, error_ttl=10).ranked() == ["gemini-2.5-pro"]
+
+
+# --- Ranking ---
+def test_ranked_fastest_first(make_registry):
+    registry = make_registry(
+        StubModels(
+            [model("gemini-slow"), model("gemini-fast"), model("gemini-broken")],
+            {"gemini-broken": RuntimeError("500")},
+        )
+    )
+    registry.list_models()
+    registry.cache["benchmarks"] = {
+        "gemini-slow": {"ttft": 2.0, "tps": 50.0, "error": None, "measured_at": 1000},
+        "gemini-fast": {"ttft": 0.3, "tps": 10.0, "error": None, "measured_at": 1000},
+    }
+
+    assert registry.ranked() == ["gemini-fast", "gemini-slow"]
+    # Only the uncached model was benchmarked
+    assert registry.client.models.stream_calls == ["gemini-broken"]
+
+
+def test_ranked_tie_broken_by_throughput(make_registry):
+    registry = make_registry(StubModels([model("gemini-a"), model("gemini-b")]))
+    registry.list_models()
+    registry.cache["benchmarks"] = {
+        "gemini-a": {"ttft": 0.5, "tps": 10.0, "error": None, "measured_at": 1000},
+        "gemini-b": {"ttft": 0.5, "tps": 30.0, "error": None, "measured_at": 1000},
+    }
+    assert registry.ranked() == ["gemini-b", "gemini-a"]
+
+
+def test_ranked_limit_caps_new_benchmarks(make_registry):
+    models = StubModels([model(f"gemini-{i}") for i in range(5)])
+    registry = make_registry(models)
+    registry.list_models()
+    # e.g. saved earlier by check_models.py, outside the first `limit` models
+    registry.cache["benchmarks"]["gemini-4"] = {
+        "ttft": 0.1, "tps": 10.0, "error": None, "measured_at": 1000
+    }
+
+    ranked = registry.ranked(limit=2)
+    assert models.stream_calls == ["gemini-0", "gemini-1"]
+    assert sorted(ranked) == ["gemini-0", "gemini-1", "gemini-4"]
+
+    registry.ranked(limit=2)
+    assert models.stream_calls == ["gemini-0", "gemini-1", "gemini-2", "gemini-3"]
+
+
+def test_ranked_empty_without_candidates(make_registry):
+    assert make_registry(StubModels([model("gemma-3-27b-it")])).ranked() == []
+
+
+# --- Bad cache files ---
+@pytest.mark.parametrize("content", ["[]", "null", "not json"])
+def test_invalid_cache_treated_as_empty(tmp_path, clock, content):
+    path = tmp_path / "cache.json"
+    path.write_text(content)
+    models = StubModels([model("gemini-2.5-flash")])
+    registry = ModelRegistry(
+        SimpleNamespace(models=models), cache_path=str(path), ttl=100, clock=clock
+    )
+    assert registry.ranked() == ["gemini-2.5-flash"]
+
+
+def test_old_cache_entries_without_measured_at(make_registry):
+    registry = make_registry(StubModels([model("gemini-a"), model("gemini-b")]))
+    registry.list_models()
+    registry.cache["benchmarks"] = {"gemini-a": {"error": "429"}, "gemini-b": {}}
+
+    # Old error retried, incomplete entry re-benchmarked
+    assert sorted(registry.ranked()) == ["gemini-a", "gemini-b"]
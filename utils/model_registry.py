@@ -0,0 +1,156 @@
+import os, json, time
+
+# Local cache of the Gemini model catalog + benchmark results (defaults,
+# overridden by MODEL_CACHE_PATH / MODEL_CACHE_TTL, read when the registry is built)
+CACHE_PATH = ".model_cache.json"
+CACHE_TTL = 24 * 60 * 60  # seconds
+ERROR_TTL = 5 * 60  # seconds before a failed benchmark is retried
+
+# Small prompt used to probe each model (keep it short, it costs tokens)
+BENCHMARK_PROMPT = "Count from 1 to 20, separated by commas."
+
+# Model families that can't be used as a chat agent (no tool calling)
+NON_CHAT_KEYWORDS = ("embedding", "aqa", "imagen", "veo", "tts", "image", "audio")
+
+
+class ModelRegistry:
+    """
+    Caches the model catalog on disk (with a TTL), benchmarks candidate models
+    and ranks them by speed.
+    `client` is anything shaped like `google.genai.Client` (`client.models.list()`
+    & `client.models.generate_content_stream()`), so a stub works for testing.
+    """
+
+    def __init__(
+        self, client, cache_path=None, ttl=None, error_ttl=ERROR_TTL, clock=time.time
+    ):
+        self.client = client
+        self.cache_path = cache_path or os.environ.get("MODEL_CACHE_PATH", CACHE_PATH)
+        if ttl is None:
+            ttl = int(os.environ.get("MODEL_CACHE_TTL", CACHE_TTL))
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.clock = clock  # Wall clock for the TTL (swappable for testing)
+        self.cache = self._load()
+
+    # --- Cache ---
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict):  # e.g. '[]' or 'null'
+            cache = {}
+        cache.setdefault("fetched_at", 0)
+        cache.setdefault("models", {})
+        cache.setdefault("benchmarks", {})
+        return cache
+
+    def _save(self):
+        try:
+            with open(self.cache_path, "w") as f:
+                json.dump(self.cache, f, indent=2)
+        except OSError as e:
+            print(f"Could not write model cache '{self.cache_path}': {e}")
+
+    def is_stale(self) -> bool:
+        return self.clock() - self.cache["fetched_at"] > self.ttl
+
+    # --- Catalog ---
+    def list_models(self, refresh: bool = False) -> dict:
+        """Returns {name: info} for all models, from cache unless stale."""
+        if refresh or self.is_stale() or not self.cache["models"]:
+            models = {}
+            for model in self.client.models.list():
+                name = model.name.removeprefix("models/")
+                models[name] = {
+                    "context": getattr(model, "input_token_limit", None) or 0,
+                    "actions": list(getattr(model, "supported_actions", None) or []),
+                }
+            self.cache["models"] = models
+            self.cache["fetched_at"] = self.clock()
+            # Benchmarks from an old catalog are stale too
+            self.cache["benchmarks"] = {}
+            self._save()
+        return self.cache["models"]
+
+    def candidates(self, tools: bool = True, min_context: int = 0) -> list[str]:
+        """Model names that meet the capability filter (tool calling, context size)."""
+        names = []
+        for name, info in self.list_models().items():
+            if "generateContent" not in info["actions"]:
+                continue
+            if tools and (
+                not name.startswith("gemini")
+                or any(k in name for k in NON_CHAT_KEYWORDS)
+            ):
+                continue
+            if info["context"] < min_context:
+                continue
+            names.append(name)
+        return names
+
+    # --- Benchmark ---
+    def benchmark(self, name: str, timer=time.perf_counter) -> dict:
+        """Measures time-to-first-token (s) & throughput (tokens/s) for a model."""
+        start = timer()
+        first = None
+        tokens = 0
+        try:
+            stream = self.client.models.generate_content_stream(
+                model=name, contents=BENCHMARK_PROMPT
+            )
+            for chunk in stream:
+                if first is None and getattr(chunk, "text", None):
+                    first = timer()
+                usage = getattr(chunk, "usage_metadata", None)
+                if usage and getattr(usage, "candidates_token_count", None):
+                    tokens = usage.candidates_token_count  # Running total
+            # Throughput over the whole call, as `tokens` includes the first chunk
+            end = timer()
+            if first is None:
+                raise ValueError("empty response")
+            result = {
+                "ttft": round(first - start, 4),
+                "tps": round(tokens / (end - start), 2) if end > start else 0.0,
+                "error": None,
+            }
+        except Exception as e:
+            result = {"ttft": None, "tps": None, "error": str(e)}
+
+        result["measured_at"] = self.clock()
+        self.cache["benchmarks"][name] = result
+        self._save()
+        return result
+
+    def needs_benchmark(self, name: str) -> bool:
+        """No (usable) cached result, or a failed one old enough to retry."""
+        result = self.cache["benchmarks"].get(name)
+        if result is None:
+            return True
+        if result.get("error") is None:
+            return result.get("ttft") is None  # Incomplete entry (older cache)
+        return self.clock() - result.get("measured_at", 0) > self.error_ttl
+
+    def ranked(self, tools: bool = True, min_context: int = 0, limit=None) -> list[str]:
+        """
+        Candidate models, fastest (lowest time-to-first-token) first.
+        Cached results are always used; `limit` caps the number of new benchmark
+        calls (all if None) to keep startup fast. Failed ones are dropped.
+        """
+        names = self.candidates(tools=tools, min_context=min_context)
+        todo = [n for n in names if self.needs_benchmark(n)]
+        for name in todo[:limit]:
+            self.benchmark(name)
+        results = self.cache["benchmarks"]
+        ok = [
+            n
+            for n in names
+            if n in results
+            and results[n].get("error") is None
+            and results[n].get("ttft") is not None
+        ]
+        # Fastest first, ties broken by throughput
+        speed = lambda n: (results[n]["ttft"], -(results[n].get("tps") or 0))
+        return sorted(ok, key=speed)